@@ -5,6 +5,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from src.pipeline.stats.likelihood import LikelihoodEngine  # <--- IMPORT THE ENGINE
+from src.pipeline.service.client import ScoringClient
 
 BASELINE_PATH = "data/out.csv"
 
@@ -16,6 +17,11 @@ def _load_baseline() -> pd.DataFrame:
     except FileNotFoundError:
         return pd.DataFrame()
 
+@st.cache_resource(show_spinner="Fitting Likelihood Curve...")
+def _likelihood_engine(target_stat: str) -> LikelihoodEngine:
+    # One fitted engine per statistic, shared across reruns and sessions
+    return LikelihoodEngine(_load_baseline()[target_stat].dropna().values)
+
 def render_baseline() -> None:
     
     df = _load_baseline()
@@ -30,9 +36,8 @@ def render_baseline() -> None:
     target_stat = st.selectbox("Select Statistic", options=numeric_cols, index=1)
 
     # --- USE THE ENGINE ---
-    # 1. Initialize the Brain with column data
-    data_series = df[target_stat].dropna()
-    engine = LikelihoodEngine(data_series.values)
+    # 1. Initialize the Brain with column data (cached per statistic)
+    engine = _likelihood_engine(target_stat)
     
     # 2. Get Plotting Data from Brain
     x_curve, y_curve = engine.get_curve_points()
@@ -60,11 +65,27 @@ def render_baseline() -> None:
     # Interactive "What If" Checker (Bonus)
     st.divider()
     test_val = st.number_input(f"Test a hypothetical {target_stat} value:", value=engine.mean)
-    decision = engine.evaluate(test_val)
-    
-    if decision.status == "CLEAN":
-        st.success(f"✅ {decision.message}")
-    elif decision.status == "WARNING":
-        st.warning(f"⚠️ {decision.message}")
+
+    # Scored by the local service so the page never rebuilds the pipeline models
+    client = ScoringClient()
+    if not client.available():
+        st.info("Start the scoring service (`uv run run-scoring-service`) to check values.")
+        return
+
+    try:
+        row = client.score({"what-if": {target_stat: float(test_val)}})[0]
+    except (OSError, RuntimeError, ValueError) as exc:
+        st.error(f"Scoring service failed: {exc}")
+        return
+    status = row.get(f"{target_stat}_status", "NOT_EVALUATED")
+    p_value = row.get(f"{target_stat}_p_value")
+    message = f"{target_stat} = {test_val:g}" + (f" (p = {p_value:.4f})" if p_value is not None else "")
+
+    if status == "CLEAN":
+        st.success(f"✅ {message}")
+    elif status == "WARNING":
+        st.warning(f"⚠️ {message}")
+    elif status == "ERROR":
+        st.error(f"🚨 {message}")
     else:
-        st.error(f"🚨 {decision.message}")
\ No newline at end of file
+        st.info(f"{message} is not tracked by the pipeline models")
\ No newline at end of file
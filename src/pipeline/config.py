@@ -18,3 +18,68 @@ P_VALUE_THRESHOLDS = {
     "error": 0.01,
     "warning": 0.05,
 }
+
+# Bounds for the deterministic business rules described in docs/integrity.md.
+RULE_THRESHOLDS = {
+    "min_age": 14,
+    "min_minutes_best_of_5": 45,
+    "max_minutes_best_of_5": 480,
+    "max_points_in_row": 12,
+}
+
+# SofaScore keys feeding the deterministic rules, mapped to the Sackmann
+# column suffixes for the item value and, where reported, its total.
+SOFASCORE_RULE_INPUTS = {
+    "firstServeAccuracy": ("1stIn", "svpt"),
+    "maxPointsInRow": ("maxPointsInRow", None),
+}
+
+# Sackmann archive column suffixes to the internal metric suffixes above
+# (mirrors the rename in notebooks/01_preparation.qmd).
+SACKMANN_TO_BASELINE = {
+    "ace": "aces",
+    "df": "doubleFaults",
+    "1stWon": "firstServePointsAccuracy",
+    "2ndWon": "secondServePointsAccuracy",
+    "bpSaved": "breakPointsSaved",
+}
+
+ARCHIVE_DIR = Path("data")
+
+# Archive rows behind data/out.csv (mirrors the filter in
+# notebooks/01_preparation.qmd); the windowed baselines and the historical
+# replay default to the same population.
+BASELINE_POPULATION_QUERY = 'tourney_name == "Australian Open"'
+DEFAULT_PLAYER_BASELINE_PATH = Path("data/player_baselines.pkl")
+
+# Binning and minimum history for the per-player baselines. Histories only
+# use best-of-5 matches so count totals are comparable with the scored AO.
+PLAYER_BASELINE = {
+    "bins": 64,
+    "min_matches": 10,
+    "query": "best_of == 5",
+}
+
+DEFAULT_WINDOW_BASELINE_PATH = Path("data/window_baselines.pkl")
+
+# Binning for the per-year densities behind the rolling-window baselines.
+WINDOW_BASELINE = {
+    "bins": 512,
+    "min_samples": 5,
+}
+
+DEFAULT_REPLAY_DIR = Path("data/replay")
+
+# Local scoring service that keeps the models loaded between runs.
+SCORING_SERVICE_HOST = "127.0.0.1"
+SCORING_SERVICE_PORT = 8765
+DEFAULT_SCORING_URL = f"http://{SCORING_SERVICE_HOST}:{SCORING_SERVICE_PORT}"
+
+DEFAULT_IDENTITY_INDEX_PATH = Path("data/player_identity.pkl")
+
+# Minimum trigram Jaccard similarity for a fuzzy SofaScore -> Sackmann match.
+IDENTITY_MIN_SIMILARITY = 0.5
+
+# Initials and fuzzy name matches are only accepted with at least this much
+# attribute agreement (IOC match +1, hand and height +0.5 each).
+IDENTITY_MIN_FEATURE_SCORE = 1.0
@@ -4,80 +4,139 @@ from __future__ import annotations
 
 import datetime as _dt
 from pathlib import Path
-from typing import Iterable
 
 import pandas as pd
 from curl_cffi import requests
 from prefect import flow, get_run_logger
 
-from ..config import DEFAULT_BASELINE_PATH, SOFASCORE_TO_BASELINE
-from ..models.tennis_models import Decision, aggregate_status
-from ..stats.calculators import KDEModel, build_kde_models, evaluate_metric
-from ..tasks.match_id import get_match_ids
-from ..tasks.match_stats import get_match_stats
+from ..config import (
+    BASELINE_POPULATION_QUERY,
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_IDENTITY_INDEX_PATH,
+    DEFAULT_PLAYER_BASELINE_PATH,
+    DEFAULT_WINDOW_BASELINE_PATH,
+)
+from ..service.client import ScoringClient
+from ..stats.identity import load_identity_index
+from ..tasks.match_id import get_match_events
+from ..tasks.match_stats import event_metrics, get_match_stats
+
+
+def _score_locally(
+    fetched: dict[str, dict[str, float]],
+    player_ids: dict[str, tuple[int | None, int | None]],
+    ingest_ids: dict[str, tuple[int | None, int | None]],
+    baseline_path: str | Path,
+    player_baseline_path: str | Path,
+    window_years: int | None,
+    window_baseline_path: str | Path,
+    window_query: str | None,
+) -> list[dict[str, object]]:
+    # Imported lazily so service-backed runs skip the pandas/scipy model stack.
+    from ..stats.calculators import build_kde_models
+    from ..stats.players import load_player_baselines
+    from ..stats.scoring import ingest_matches, score_matches, tracked_columns
+    from ..stats.windows import load_windowed_baselines
 
+    logger = get_run_logger()
+    columns = tracked_columns()
+    if window_years:
+        # Score against the last N archive seasons from cached yearly densities.
+        windowed = load_windowed_baselines(
+            window_baseline_path, columns, query=window_query
+        )
+        models = windowed.models(window_years)
+        logger.info("Using %d-year window ending %s", window_years, windowed.last_year)
+    else:
+        models = build_kde_models(baseline_path, columns)
+    if not models:
+        logger.warning("No KDE models built; results will be marked NOT_EVALUATED")
+    player_baselines = load_player_baselines(player_baseline_path, columns)
 
-def _tracked_columns() -> list[str]:
-    suffixes = set(SOFASCORE_TO_BASELINE.values())
-    return [f"{prefix}_{suffix}" for suffix in sorted(suffixes) for prefix in ("w", "l")]
-
-
-def _evaluate_match(
-    match_id: str,
-    metrics: dict[str, float],
-    tracked_columns: Iterable[str],
-    models: dict[str, KDEModel],
-) -> dict[str, object]:
-    row: dict[str, object] = {"match_id": match_id}
-    statuses: list[Decision] = []
-
-    for column in tracked_columns:
-        value = metrics.get(column)
-        evaluation = evaluate_metric(column, value, models)
-        row[column] = evaluation.value
-        row[f"{column}_p_value"] = evaluation.p_value
-        row[f"{column}_status"] = evaluation.status.value
-        statuses.append(evaluation.status)
-
-    row["overall_status"] = aggregate_status(statuses).value
-    return row
+    # Score first, then fold the matches in so they never judge themselves.
+    results = score_matches(fetched, models, player_baselines, player_ids, columns)
+    ingested = ingest_matches(player_baselines, fetched, ingest_ids, player_baseline_path)
+    if ingested:
+        logger.info("Folded %d matches into player baselines", ingested)
+    return results
 
 
 @flow(name="AO-2026-Truth-Engine")
 def run_pipeline(
     date: str | None = None,
     baseline_path: str | Path = DEFAULT_BASELINE_PATH,
+    player_baseline_path: str | Path = DEFAULT_PLAYER_BASELINE_PATH,
     report_path: str | Path = "AO_2026.xlsx",
+    window_years: int | None = None,
+    window_baseline_path: str | Path = DEFAULT_WINDOW_BASELINE_PATH,
+    window_query: str | None = BASELINE_POPULATION_QUERY,
+    use_service: bool = True,
+    identity_index_path: str | Path = DEFAULT_IDENTITY_INDEX_PATH,
 ) -> None:
     logger = get_run_logger()
 
-    columns = _tracked_columns()
-    models = build_kde_models(baseline_path, columns)
-    if not models:
-        logger.warning("No KDE models built; results will be marked NOT_EVALUATED")
-
     resolved_date = None
     if isinstance(date, str) and date:
         resolved_date = _dt.date.fromisoformat(date)
     else:
         resolved_date = date
 
-    match_ids_future = get_match_ids.submit(date=resolved_date)
-    match_ids = match_ids_future.result()
-    if not match_ids:
+    events_future = get_match_events.submit(date=resolved_date)
+    events = events_future.result()
+    if not events:
         logger.info("No matches to process")
         return
+    match_ids = [str(event["id"]) for event in events]
 
-    results: list[dict[str, object]] = []
+    fetched: dict[str, dict[str, float]] = {}
     with requests.Session(impersonate="chrome120") as session:
-        for match_id in match_ids:
+        for match_id, event in zip(match_ids, events):
             try:
-                metrics = get_match_stats.fn(session, match_id)
+                fetched[match_id] = {
+                    **get_match_stats.fn(session, match_id, event.get("winnerCode")),
+                    **event_metrics(event),
+                }
             except Exception as exc:  # pragma: no cover - Prefect handles logging
                 logger.warning("Skipping match %s due to fetch error: %s", match_id, exc)
-                continue
 
-            results.append(_evaluate_match(match_id, metrics, columns, models))
+    # Sackmann ids for each SofaScore event; unresolved players only get
+    # population p-values, and only confident matches are folded back in.
+    identity_index = load_identity_index(identity_index_path)
+    cached = len(identity_index.sofascore)
+    player_ids = identity_index.resolve_events(events)
+    ingest_ids = identity_index.resolve_events(events, confident_only=True)
+    if len(identity_index.sofascore) > cached:
+        identity_index.save(identity_index_path)
+
+    results = None
+    client = ScoringClient()
+    if use_service and client.available():
+        logger.info("Scoring %d matches via service at %s", len(fetched), client.url)
+        # The service refuses (and we fall back) if it has other baselines loaded.
+        artifacts = {"baseline": baseline_path, "player_baseline": player_baseline_path}
+        if window_years:
+            artifacts.update(window_baseline=window_baseline_path, window_query=window_query)
+        try:
+            results = client.score(
+                fetched,
+                player_ids,
+                window_years=window_years,
+                ingest_ids=ingest_ids,
+                artifacts=artifacts,
+            )
+        except (OSError, RuntimeError, ValueError) as exc:
+            logger.warning("Scoring service failed (%s); scoring locally", exc)
+    if results is None:
+        results = _score_locally(
+            fetched,
+            player_ids,
+            ingest_ids,
+            baseline_path,
+            player_baseline_path,
+            window_years,
+            window_baseline_path,
+            window_query,
+        )
 
     if results:
         df = pd.DataFrame(results)
@@ -0,0 +1,63 @@
+"""Prefect flow replaying the Sackmann archive through the integrity checks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+from prefect import flow, get_run_logger
+
+from ..config import (
+    ARCHIVE_DIR,
+    BASELINE_POPULATION_QUERY,
+    DEFAULT_REPLAY_DIR,
+    DEFAULT_WINDOW_BASELINE_PATH,
+)
+from ..stats.replay import replay_archive
+from ..stats.scoring import tracked_columns
+from ..stats.windows import load_windowed_baselines
+
+
+@flow(name="AO-Historical-Replay")
+def run_replay(
+    archive_dir: str | Path = ARCHIVE_DIR,
+    window_baseline_path: str | Path = DEFAULT_WINDOW_BASELINE_PATH,
+    output_dir: str | Path = DEFAULT_REPLAY_DIR,
+    max_workers: int | None = None,
+    whole_tour: bool = False,
+) -> None:
+    logger = get_run_logger()
+
+    columns = tracked_columns()
+    # Same population and cached densities as the live windowed baseline.
+    baselines = load_windowed_baselines(
+        window_baseline_path, columns, archive_dir, BASELINE_POPULATION_QUERY
+    )
+    results = [
+        replay_archive(columns, archive_dir, baselines, max_workers, BASELINE_POPULATION_QUERY)
+    ]
+    if whole_tour:
+        # Built in memory so the live cache keeps the AO population.
+        results.append(replay_archive(columns, archive_dir, None, max_workers, query=None))
+
+    by_year = pd.concat([result[0] for result in results], ignore_index=True)
+    by_tournament = pd.concat([result[1] for result in results], ignore_index=True)
+    if by_year.empty:
+        logger.info("No archive seasons found in %s", archive_dir)
+        return
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    by_year.to_csv(output_dir / "flag_rates_by_year.csv", index=False)
+    by_tournament.to_csv(output_dir / "flag_rates_by_tournament.csv", index=False)
+    for population, rows in by_year.groupby("population"):
+        logger.info(
+            "Replayed %d %s matches; overall flag rate %.2f%%",
+            rows["matches"].sum(),
+            population,
+            100 * (rows["warning"].sum() + rows["error"].sum()) / max(rows["evaluated"].sum(), 1),
+        )
+
+
+if __name__ == "__main__":
+    run_replay()
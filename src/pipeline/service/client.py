@@ -0,0 +1,72 @@
+"""Stdlib-only client for the local scoring service.
+
+Kept free of pandas/scipy/prefect imports so callers pay no model-build or
+import cost when the service is running.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from urllib import error, request
+
+from ..config import DEFAULT_SCORING_URL
+
+
+class ScoringClient:
+    def __init__(self, url: str = DEFAULT_SCORING_URL, timeout: float = 30.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def available(self, timeout: float = 0.5) -> bool:
+        try:
+            with request.urlopen(f"{self.url}/health", timeout=timeout) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def health(self) -> dict[str, object]:
+        with request.urlopen(f"{self.url}/health", timeout=self.timeout) as response:
+            return json.load(response)
+
+    def score(
+        self,
+        matches: dict[str, dict[str, float]],
+        player_ids: dict[str, tuple[int | None, int | None]] | None = None,
+        window_years: int | None = None,
+        ingest_ids: dict[str, tuple[int | None, int | None]] | None = None,
+        artifacts: dict[str, str | Path | None] | None = None,
+    ) -> list[dict[str, object]]:
+        """Score ``match_id -> metrics``; returns the same rows as ``score_matches``.
+
+        Matches in ``ingest_ids`` are folded into the player baselines under
+        those ids after scoring.
+        ``artifacts`` names the baseline paths (and ``window_query``) the caller
+        expects; the service rejects the request if it has different ones loaded.
+        Raises ``RuntimeError`` when the service rejects the request and
+        ``OSError`` when it cannot be reached.
+        """
+
+        expected = {
+            name: str(Path(value).resolve()) if name != "window_query" and value else value
+            for name, value in (artifacts or {}).items()
+        }
+        payload = {
+            "matches": matches,
+            "player_ids": player_ids or {},
+            "window_years": window_years,
+            "ingest_ids": ingest_ids or {},
+            "artifacts": expected,
+        }
+        req = request.Request(
+            f"{self.url}/score",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                return json.load(response)["results"]
+        except error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")
+            raise RuntimeError(f"Scoring service rejected request: {detail}") from exc
@@ -0,0 +1,262 @@
+"""Long-running localhost HTTP service that keeps scoring models in memory.
+
+Endpoints:
+
+- ``GET /health`` reports the loaded artifacts.
+- ``POST /score`` scores ``{"matches": {match_id: metrics}, "player_ids": {...},
+  "window_years": int | null, "ingest_ids": {...}, "artifacts": {...}}`` and returns
+  ``{"results": rows}``. ``artifacts`` optionally names the baseline paths and
+  ``window_query`` the caller expects; a mismatch is answered with 409.
+
+Models are rebuilt whenever a baseline artifact's mtime changes or an archive
+season is added or replaced.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from ..config import (
+    ARCHIVE_DIR,
+    BASELINE_POPULATION_QUERY,
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_PLAYER_BASELINE_PATH,
+    DEFAULT_WINDOW_BASELINE_PATH,
+    SCORING_SERVICE_HOST,
+    SCORING_SERVICE_PORT,
+)
+from ..stats.archive import archive_fingerprint
+from ..stats.calculators import KDEModel, build_kde_models
+from ..stats.players import PlayerBaselines, load_player_baselines
+from ..stats.scoring import ingest_matches, score_matches, tracked_columns
+from ..stats.windows import WindowedBaselines, load_windowed_baselines
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactMismatch(ValueError):
+    """The request expects different baseline artifacts than the service loaded."""
+
+
+class ScoringService:
+    def __init__(
+        self,
+        baseline_path: str | Path = DEFAULT_BASELINE_PATH,
+        player_baseline_path: str | Path = DEFAULT_PLAYER_BASELINE_PATH,
+        window_baseline_path: str | Path = DEFAULT_WINDOW_BASELINE_PATH,
+        window_query: str | None = BASELINE_POPULATION_QUERY,
+        archive_dir: str | Path = ARCHIVE_DIR,
+    ):
+        self.archive_dir = Path(archive_dir)
+        self.paths = {
+            "baseline": Path(baseline_path),
+            "player_baseline": Path(player_baseline_path),
+            "window_baseline": Path(window_baseline_path),
+        }
+        self.window_query = window_query or None
+        self.columns = tracked_columns()
+        self._lock = threading.RLock()
+        self._mtimes: dict[str, object] = {}
+        self.models: dict[str, KDEModel] = {}
+        self.player_baselines = PlayerBaselines()
+        self.windowed = WindowedBaselines()
+        self._window_models: dict[int, dict[str, KDEModel]] = {}
+        self.loaded_at = 0.0
+        self.load()
+
+    def _artifact_mtimes(self) -> dict[str, object]:
+        mtimes: dict[str, object] = {
+            name: path.stat().st_mtime if path.exists() else None
+            for name, path in self.paths.items()
+        }
+        # The cached baselines sync themselves with the archive on load.
+        mtimes["archive"] = archive_fingerprint(self.archive_dir)
+        return mtimes
+
+    def load(self) -> None:
+        with self._lock:
+            started = time.perf_counter()
+            self.models = build_kde_models(self.paths["baseline"], self.columns)
+            self.player_baselines = load_player_baselines(
+                self.paths["player_baseline"], self.columns, self.archive_dir
+            )
+            self.windowed = load_windowed_baselines(
+                self.paths["window_baseline"], self.columns, self.archive_dir, self.window_query
+            )
+            self._window_models = {}
+            self._mtimes = self._artifact_mtimes()
+            self.loaded_at = time.time()
+            logger.info(
+                "Loaded %d KDE models in %.2fs", len(self.models), time.perf_counter() - started
+            )
+
+    def reload_if_changed(self) -> bool:
+        with self._lock:
+            if self._artifact_mtimes() == self._mtimes:
+                return False
+            logger.info("Baseline artifact or archive changed; reloading models")
+            self.load()
+            return True
+
+    def _models_for(self, window_years: int | None) -> dict[str, KDEModel]:
+        if not window_years:
+            return self.models
+        if window_years not in self._window_models:
+            self._window_models[window_years] = self.windowed.models(window_years)
+        return self._window_models[window_years]
+
+    def artifacts(self) -> dict[str, str | None]:
+        return {
+            **{name: str(path.resolve()) for name, path in self.paths.items()},
+            "window_query": self.window_query,
+            "archive_dir": str(self.archive_dir.resolve()),
+        }
+
+    def check_artifacts(self, expected: dict[str, str | None]) -> None:
+        loaded = self.artifacts()
+        mismatched = [
+            f"{name} {value!r} != {loaded[name]!r}"
+            for name, value in expected.items()
+            if name in loaded and (value or None) != loaded[name]
+        ]
+        if mismatched:
+            raise ArtifactMismatch(
+                "Service artifacts differ from the request: " + ", ".join(mismatched)
+            )
+
+    def score(self, payload: dict[str, Any]) -> list[dict[str, object]]:
+        self.check_artifacts(payload.get("artifacts") or {})
+        matches = {str(key): value for key, value in payload.get("matches", {}).items()}
+        player_ids = _player_ids(payload.get("player_ids"))
+        ingest_ids = _player_ids(payload.get("ingest_ids"))
+
+        self.reload_if_changed()
+        with self._lock:
+            results = score_matches(
+                matches,
+                self._models_for(payload.get("window_years")),
+                self.player_baselines,
+                player_ids,
+                self.columns,
+            )
+            if ingest_ids:
+                path = self.paths["player_baseline"]
+                if ingest_matches(self.player_baselines, matches, ingest_ids, path):
+                    # Our own write should not trigger a reload.
+                    self._mtimes["player_baseline"] = path.stat().st_mtime
+        return results
+
+    def health(self) -> dict[str, object]:
+        return {
+            "status": "ok",
+            "models": sorted(self.models),
+            "window_last_year": self.windowed.last_year,
+            "artifacts": self.artifacts(),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def _player_ids(raw: dict[str, Any] | None) -> dict[str, tuple[int | None, int | None]]:
+    return {str(key): (value[0], value[1]) for key, value in (raw or {}).items()}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _ScoringHTTPServer
+
+    def _send_json(self, status: HTTPStatus, body: dict[str, object]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        self._send_json(HTTPStatus.OK, self.server.service.health())
+
+    def do_POST(self) -> None:
+        if self.path != "/score":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            results = self.server.service.score(payload)
+        except ArtifactMismatch as exc:
+            self._send_json(HTTPStatus.CONFLICT, {"error": str(exc)})
+            return
+        except (ValueError, TypeError, KeyError, IndexError, AttributeError) as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        except Exception as exc:
+            # Always answer: a dropped connection would stall the caller until timeout.
+            logger.exception("Scoring request failed")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+            return
+        self._send_json(HTTPStatus.OK, {"results": results})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: ScoringService):
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def serve(
+    host: str = SCORING_SERVICE_HOST,
+    port: int = SCORING_SERVICE_PORT,
+    service: ScoringService | None = None,
+) -> None:
+    service = service or ScoringService()
+    with _ScoringHTTPServer((host, port), service) as httpd:
+        logger.info("Scoring service listening on http://%s:%d", host, port)
+        httpd.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve integrity scoring over localhost HTTP")
+    parser.add_argument("--host", default=SCORING_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SCORING_SERVICE_PORT)
+    parser.add_argument("--baseline-path", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--player-baseline-path", default=DEFAULT_PLAYER_BASELINE_PATH)
+    parser.add_argument("--window-baseline-path", default=DEFAULT_WINDOW_BASELINE_PATH)
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument(
+        "--window-query",
+        default=BASELINE_POPULATION_QUERY,
+        help="Archive rows behind the rolling windows; pass '' for the whole tour",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    serve(
+        args.host,
+        args.port,
+        ScoringService(
+            args.baseline_path,
+            args.player_baseline_path,
+            args.window_baseline_path,
+            args.window_query or None,
+            args.archive_dir,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
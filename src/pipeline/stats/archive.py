@@ -0,0 +1,61 @@
+"""Helpers for reading the Sackmann ``atp_matches_*.csv`` archive."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from ..config import ARCHIVE_DIR, SACKMANN_TO_BASELINE
+
+_YEAR_PATTERN = re.compile(r"atp_matches_(\d{4})\.csv$")
+
+
+def archive_paths(archive_dir: str | Path = ARCHIVE_DIR) -> dict[int, Path]:
+    """Return the yearly archive files keyed by season, oldest first."""
+
+    paths: dict[int, Path] = {}
+    for path in Path(archive_dir).glob("atp_matches_*.csv"):
+        match = _YEAR_PATTERN.search(path.name)
+        if match:
+            paths[int(match.group(1))] = path
+    return dict(sorted(paths.items()))
+
+
+def archive_fingerprint(archive_dir: str | Path = ARCHIVE_DIR) -> dict[int, int]:
+    """Return each season's file mtime (ns), to spot added or replaced seasons."""
+
+    return {year: path.stat().st_mtime_ns for year, path in archive_paths(archive_dir).items()}
+
+
+def to_tracked_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename Sackmann ``w_``/``l_`` stat columns to the tracked metric names.
+
+    Also derives ``completed``: ``False`` when ``score`` marks a retirement,
+    walkover, default or abandoned match (``RET``, ``W/O``, ``DEF``, ...).
+    """
+
+    rename = {
+        f"{prefix}_{sackmann}": f"{prefix}_{suffix}"
+        for sackmann, suffix in SACKMANN_TO_BASELINE.items()
+        for prefix in ("w", "l")
+    }
+    df = df.rename(columns=rename)
+    if "score" in df:
+        # Completed scores are only games and tiebreaks, e.g. "7-6(4) 6-3".
+        completed = ~df["score"].astype("string").str.contains("[A-Za-z]", na=True)
+        df["completed"] = completed.astype(object).where(df["score"].notna())
+    return df
+
+
+def read_archive_year(path: str | Path) -> pd.DataFrame:
+    return to_tracked_columns(pd.read_csv(path, low_memory=False))
+
+
+def iter_archive(archive_dir: str | Path = ARCHIVE_DIR) -> Iterator[tuple[int, pd.DataFrame]]:
+    """Yield ``(year, frame)`` one season at a time to keep memory bounded."""
+
+    for year, path in archive_paths(archive_dir).items():
+        yield year, read_archive_year(path)
@@ -51,6 +51,10 @@ class KDEModel:
         two_tailed = 2 * min(cdf_val, 1 - cdf_val)
         return float(min(max(two_tailed, 0.0), 1.0))
 
+    def p_values(self, values: np.ndarray) -> np.ndarray:
+        cdf_vals = np.interp(values, self.grid, self.cdf, left=0.0, right=1.0)
+        return np.clip(2 * np.minimum(cdf_vals, 1 - cdf_vals), 0.0, 1.0)
+
 
 def build_kde_models(
     baseline_path: str | Path,
@@ -85,6 +89,35 @@ def evaluate_metric(
     return MetricEvaluation(value=value, p_value=p_value, status=status)
 
 
+def evaluate_column(
+    column: str,
+    values: np.ndarray,
+    models: dict[str, KDEModel],
+) -> np.ndarray:
+    """Vectorised ``evaluate_metric``: one ``Decision`` per value."""
+
+    values = np.asarray(values, dtype=float)
+    statuses = np.empty(values.shape, dtype=object)
+    statuses[:] = Decision.NOT_EVALUATED
+
+    model = models.get(column)
+    finite = np.isfinite(values)
+    if model is None or not finite.any():
+        return statuses
+
+    # p <= error -> 0, p <= warning -> 1, otherwise 2; same cut-offs as
+    # _categorise_p_value.
+    levels = np.searchsorted(
+        [P_VALUE_THRESHOLDS["error"], P_VALUE_THRESHOLDS["warning"]],
+        model.p_values(values[finite]),
+        side="left",
+    )
+    decisions = np.empty(3, dtype=object)
+    decisions[:] = [Decision.ERROR, Decision.WARNING, Decision.CLEAN]
+    statuses[finite] = decisions[levels]
+    return statuses
+
+
 def _categorise_p_value(p_value: float) -> Decision:
     if p_value <= P_VALUE_THRESHOLDS["error"]:
         return Decision.ERROR
@@ -0,0 +1,327 @@
+"""Resolve SofaScore players to Sackmann ``winner_id``/``loser_id`` values."""
+
+from __future__ import annotations
+
+import pickle
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+import pandas as pd
+
+from ..config import ARCHIVE_DIR, IDENTITY_MIN_FEATURE_SCORE, IDENTITY_MIN_SIMILARITY
+from .archive import archive_fingerprint, iter_archive
+
+PlayerIds = tuple[int | None, int | None]
+
+# ISO 3166 alpha-3 codes (SofaScore) that differ from the IOC codes (Sackmann).
+_ISO_TO_IOC = {
+    "BGR": "BUL", "CHE": "SUI", "CHL": "CHI", "DEU": "GER", "DNK": "DEN",
+    "GRC": "GRE", "HRV": "CRO", "IDN": "INA", "LVA": "LAT", "MCO": "MON",
+    "MYS": "MAS", "NLD": "NED", "PHL": "PHI", "PRT": "POR", "PRY": "PAR",
+    "SVN": "SLO", "TWN": "TPE", "URY": "URU", "ZAF": "RSA", "ZWE": "ZIM",
+}
+
+_NON_ALPHA = re.compile(r"[^a-z ]+")
+
+# Name-key tiers, most specific first.
+_NAME_TIERS = ("full", "sorted", "initials")
+
+
+def normalize_name(name: str | None) -> str:
+    """Lower-case, strip accents and punctuation, collapse whitespace."""
+
+    if not name:
+        return ""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return " ".join(_NON_ALPHA.sub(" ", ascii_name.lower().replace("-", " ")).split())
+
+
+def _name_keys(normalized: str) -> dict[str, str]:
+    """Exact-match keys per tier: full name, token-sorted name and initials + surname."""
+
+    tokens = normalized.split()
+    if not tokens:
+        return {}
+
+    keys = {"full": normalized, "sorted": " ".join(sorted(tokens))}
+    initials = [token for token in tokens if len(token) == 1]
+    rest = [token for token in tokens if len(token) > 1]
+    if initials and rest:
+        # "j sinner" / "sinner j" style short names.
+        keys["initials"] = f"{initials[0]} {' '.join(rest)}"
+    elif len(tokens) > 1:
+        keys["initials"] = f"{tokens[0][0]} {' '.join(tokens[1:])}"
+    return keys
+
+
+def _trigrams(normalized: str) -> set[str]:
+    padded = f"  {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(slots=True)
+class PlayerRecord:
+    player_id: int
+    name: str
+    ioc: str | None
+    hand: str | None
+    height: float | None
+    last_year: int
+
+
+@dataclass(slots=True)
+class IdentityIndex:
+    """Name-key and trigram indexes over Sackmann players plus cached mappings.
+
+    ``keys`` maps each name tier to its ``key -> player ids`` index.
+    ``sofascore`` caches confidently resolved SofaScore team ids, so repeat
+    lookups are a single dict access.
+    """
+
+    players: dict[int, PlayerRecord] = field(default_factory=dict)
+    keys: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+    trigrams: dict[str, list[int]] = field(default_factory=dict)
+    name_trigrams: dict[int, frozenset[str]] = field(default_factory=dict)
+    sofascore: dict[int, int] = field(default_factory=dict)
+    # Archive directory and season fingerprint the index was built from.
+    source: tuple = ()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> IdentityIndex:
+        """Build from a frame with ``player_id, name, ioc, hand, height, year`` columns."""
+
+        index = cls()
+        df = df.dropna(subset=["player_id", "name"]).sort_values("year")
+        latest = df.drop_duplicates("player_id", keep="last")
+        for row in latest.itertuples(index=False):
+            index.players[int(row.player_id)] = PlayerRecord(
+                player_id=int(row.player_id),
+                name=row.name,
+                ioc=row.ioc if isinstance(row.ioc, str) else None,
+                hand=row.hand if isinstance(row.hand, str) else None,
+                height=float(row.height) if pd.notna(row.height) else None,
+                last_year=int(row.year),
+            )
+
+        keys: dict[str, dict[str, set[int]]] = {tier: {} for tier in _NAME_TIERS}
+        grams: dict[str, set[int]] = {}
+        name_grams: dict[int, set[str]] = {}
+        for player_id, name in df[["player_id", "name"]].drop_duplicates().itertuples(index=False):
+            normalized = normalize_name(name)
+            for tier, key in _name_keys(normalized).items():
+                keys[tier].setdefault(key, set()).add(int(player_id))
+            name_grams.setdefault(int(player_id), set()).update(_trigrams(normalized))
+
+        for player_id, player_grams in name_grams.items():
+            for gram in player_grams:
+                grams.setdefault(gram, set()).add(player_id)
+
+        index.keys = {
+            tier: {key: sorted(ids) for key, ids in by_key.items()}
+            for tier, by_key in keys.items()
+        }
+        index.trigrams = {gram: sorted(ids) for gram, ids in grams.items()}
+        index.name_trigrams = {pid: frozenset(value) for pid, value in name_grams.items()}
+        return index
+
+    def _attribute_score(
+        self,
+        record: PlayerRecord,
+        ioc: str | None,
+        hand: str | None,
+        height: float | None,
+    ) -> float:
+        score = 0.0
+        if ioc and record.ioc:
+            score += 1.0 if ioc == record.ioc else -1.0
+        if hand and record.hand:
+            score += 0.5 if hand == record.hand else -0.5
+        if height and record.height:
+            score += 0.5 if abs(height - record.height) <= 3 else -0.5
+        return score
+
+    def _feature_score(
+        self,
+        record: PlayerRecord,
+        ioc: str | None,
+        hand: str | None,
+        height: float | None,
+    ) -> float:
+        # Recency only breaks ties between otherwise identical candidates.
+        return self._attribute_score(record, ioc, hand, height) + record.last_year / 1e5
+
+    def _agrees(self, player_id: int, ioc: str | None, hand: str | None, height: float | None) -> bool:
+        record = self.players[player_id]
+        return self._attribute_score(record, ioc, hand, height) >= IDENTITY_MIN_FEATURE_SCORE
+
+    def _best(self, candidates: Iterable[int], ioc: str | None, hand: str | None, height: float | None) -> int:
+        return max(
+            candidates,
+            key=lambda pid: self._feature_score(self.players[pid], ioc, hand, height),
+        )
+
+    def _fuzzy(self, normalized: str, ioc: str | None, hand: str | None, height: float | None) -> int | None:
+        query = _trigrams(normalized)
+        overlap: Counter[int] = Counter()
+        for gram in query:
+            overlap.update(self.trigrams.get(gram, ()))
+
+        best_id, best_score = None, 0.0
+        for player_id, shared in overlap.items():
+            similarity = shared / len(query | self.name_trigrams[player_id])
+            if similarity < IDENTITY_MIN_SIMILARITY:
+                continue
+            if not self._agrees(player_id, ioc, hand, height):
+                continue
+            score = similarity + 0.1 * self._feature_score(self.players[player_id], ioc, hand, height)
+            if score > best_score:
+                best_id, best_score = player_id, score
+        return best_id
+
+    def resolve(
+        self,
+        sofascore_id: int | None,
+        names: Iterable[str | None],
+        ioc: str | None = None,
+        hand: str | None = None,
+        height: float | None = None,
+    ) -> tuple[int | None, bool]:
+        """Return ``(sackmann_id, confident)`` for a SofaScore player.
+
+        Name tiers are tried in order and the first with candidates decides. A
+        unique full or token-sorted hit is confident unless its attributes
+        contradict the player. Initials and trigram hits must agree on
+        IOC/hand/height (``IDENTITY_MIN_FEATURE_SCORE``), and trigram hits are
+        never confident. Only confident matches are cached.
+        """
+
+        if sofascore_id is not None and sofascore_id in self.sofascore:
+            return self.sofascore[sofascore_id], True
+
+        normalized_names = [normalize_name(name) for name in names if name]
+        resolved, confident = None, False
+        for tier in _NAME_TIERS:
+            candidates = {
+                player_id
+                for normalized in normalized_names
+                for player_id in self.keys.get(tier, {}).get(_name_keys(normalized).get(tier), ())
+            }
+            agreeing = [pid for pid in candidates if self._agrees(pid, ioc, hand, height)]
+            if not candidates or (tier == "initials" and not agreeing):
+                continue
+            if len(candidates) == 1 and tier != "initials":
+                resolved = next(iter(candidates))
+                confident = self._attribute_score(self.players[resolved], ioc, hand, height) >= 0
+            else:
+                resolved = self._best(agreeing or candidates, ioc, hand, height)
+                confident = len(agreeing) == 1
+            break
+        else:
+            for normalized in normalized_names:
+                resolved = self._fuzzy(normalized, ioc, hand, height)
+                if resolved is not None:
+                    break
+
+        if confident and sofascore_id is not None:
+            self.sofascore[sofascore_id] = resolved
+        return resolved, confident
+
+    def resolve_team(self, team: dict[str, Any]) -> tuple[int | None, bool]:
+        country = team.get("country") or {}
+        ioc = country.get("alpha3")
+        info = team.get("playerTeamInfo") or {}
+        plays = str(info.get("plays") or "").lower()
+        height = info.get("height")
+        return self.resolve(
+            team.get("id"),
+            (team.get("name"), team.get("shortName"), (team.get("slug") or "").replace("-", " ")),
+            ioc=_ISO_TO_IOC.get(ioc, ioc),
+            hand="R" if plays.startswith("right") else "L" if plays.startswith("left") else None,
+            height=float(height) * 100 if height else None,
+        )
+
+    def resolve_events(
+        self,
+        events: Iterable[dict[str, Any]],
+        confident_only: bool = False,
+    ) -> dict[str, PlayerIds]:
+        """Map SofaScore event ids to ``(winner_id, loser_id)`` Sackmann ids.
+
+        With ``confident_only`` low-confidence ids are ``None``; use that for
+        anything written back into the player baselines.
+        """
+
+        resolved: dict[str, PlayerIds] = {}
+        for event in events:
+            winner_code = event.get("winnerCode")
+            if winner_code not in (1, 2):
+                continue
+            home, home_confident = self.resolve_team(event.get("homeTeam") or {})
+            away, away_confident = self.resolve_team(event.get("awayTeam") or {})
+            if confident_only:
+                home = home if home_confident else None
+                away = away if away_confident else None
+            resolved[str(event["id"])] = (home, away) if winner_code == 1 else (away, home)
+        return resolved
+
+    def save(self, path: str | Path) -> None:
+        with Path(path).open("wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str | Path) -> IdentityIndex:
+        with Path(path).open("rb") as fh:
+            return pickle.load(fh)
+
+
+def build_identity_index(archive_dir: str | Path = ARCHIVE_DIR) -> IdentityIndex:
+    """Collect every name and latest IOC/hand/height per player from the archive."""
+
+    source = _source_key(archive_dir)
+    frames = []
+    for year, df in iter_archive(archive_dir):
+        for role in ("winner", "loser"):
+            columns = [f"{role}_{field}" for field in ("id", "name", "ioc", "hand", "ht")]
+            if not all(column in df for column in columns):
+                continue
+            frame = df[columns].set_axis(["player_id", "name", "ioc", "hand", "height"], axis=1)
+            frames.append(frame.drop_duplicates().assign(year=year))
+    index = IdentityIndex()
+    if frames:
+        index = IdentityIndex.from_frame(pd.concat(frames, ignore_index=True))
+    index.source = source
+    return index
+
+
+def _source_key(archive_dir: str | Path) -> tuple:
+    return (str(Path(archive_dir).resolve()), tuple(archive_fingerprint(archive_dir).items()))
+
+
+def load_identity_index(
+    path: str | Path,
+    archive_dir: str | Path = ARCHIVE_DIR,
+) -> IdentityIndex:
+    """Load the cached index, rebuilding it when the archive's seasons changed.
+
+    Confident SofaScore mappings survive a rebuild as long as their Sackmann
+    player is still in the archive.
+    """
+
+    path = Path(path)
+    cached = IdentityIndex.load(path) if path.exists() else None
+    if cached is not None and getattr(cached, "source", ()) == _source_key(archive_dir):
+        return cached
+
+    index = build_identity_index(archive_dir)
+    if cached is not None:
+        index.sofascore = {
+            sofascore_id: player_id
+            for sofascore_id, player_id in cached.sofascore.items()
+            if player_id in index.players
+        }
+    index.save(path)
+    return index
@@ -0,0 +1,164 @@
+"""Score the Sackmann archive season by season against held-out baselines."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ..config import ARCHIVE_DIR, BASELINE_POPULATION_QUERY
+from ..models.tennis_models import Decision
+from .archive import archive_paths, read_archive_year
+from .calculators import KDEModel, evaluate_column
+from .rules import DETERMINISTIC_RULES, Rule, evaluate_rules
+from .windows import WindowedBaselines, build_windowed_baselines
+
+# The surface rule only holds for the Australian Open, not the whole tour.
+REPLAY_RULES: tuple[Rule, ...] = tuple(
+    rule for rule in DETERMINISTIC_RULES if rule.name != "surface"
+)
+
+_SEVERITY = {
+    Decision.NOT_EVALUATED: 0,
+    Decision.CLEAN: 1,
+    Decision.WARNING: 2,
+    Decision.ERROR: 3,
+}
+_FLAGGED = (Decision.WARNING, Decision.ERROR)
+
+
+def score_frame(
+    df: pd.DataFrame,
+    columns: Iterable[str],
+    models: dict[str, KDEModel],
+    rules: Iterable[Rule] = REPLAY_RULES,
+) -> pd.DataFrame:
+    """Return per-column, per-rule and overall statuses for every row of ``df``."""
+
+    statuses = {
+        f"{column}_status": evaluate_column(
+            column,
+            df[column].to_numpy(dtype=float) if column in df else np.full(len(df), np.nan),
+            models,
+        )
+        for column in columns
+    }
+    scored = pd.concat(
+        [pd.DataFrame(statuses, index=df.index), evaluate_rules(df, rules)],
+        axis=1,
+    )
+
+    # Row-wise aggregate_status: the most severe decision wins.
+    ranks = scored.apply(lambda col: col.map(_SEVERITY)).to_numpy().max(axis=1, initial=0)
+    by_rank = {rank: decision for decision, rank in _SEVERITY.items()}
+    scored["overall_status"] = pd.Series(ranks, index=df.index).map(by_rank)
+    return scored
+
+
+def _flag_rates(scored: pd.DataFrame, by: list[pd.Series] | None = None) -> pd.DataFrame:
+    """Sum flags per group; rates are over matches with at least one stat scored.
+
+    Rule-only rows (e.g. seasons without serve stats, where only the age rules
+    run) are not ``evaluated``, so such years get a NaN rate rather than 0.
+    """
+
+    # ``isin`` rather than ``==``: pandas may store the mapped decisions with a
+    # string dtype, which does not compare equal to the enum members.
+    overall = scored["overall_status"]
+    stat_columns = [
+        column for column in scored.columns.drop("overall_status")
+        if not column.startswith("rule_")
+    ]
+    evaluated = (~scored[stat_columns].isin([Decision.NOT_EVALUATED])).any(axis=1)
+    summary = pd.DataFrame({
+        "matches": 1,
+        "evaluated": evaluated,
+        "warning": evaluated & overall.isin([Decision.WARNING]),
+        "error": evaluated & overall.isin([Decision.ERROR]),
+    }, index=scored.index)
+    for column in scored.columns.drop("overall_status"):
+        summary[column.removesuffix("_status") + "_flagged"] = scored[column].isin(_FLAGGED)
+
+    if by is not None:
+        summary = summary.groupby(by, dropna=False).sum()
+    else:
+        summary = summary.sum().to_frame().T
+
+    summary["flag_rate"] = (summary["warning"] + summary["error"]) / summary["evaluated"].where(
+        summary["evaluated"] > 0
+    )
+    summary["error_rate"] = summary["error"] / summary["evaluated"].where(summary["evaluated"] > 0)
+    return summary
+
+
+def population_label(query: str | None) -> str:
+    return query or "whole tour"
+
+
+def replay_year(
+    year: int,
+    path: str | Path,
+    columns: list[str],
+    models: dict[str, KDEModel],
+    query: str | None = BASELINE_POPULATION_QUERY,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Score one season's ``query`` rows; returns yearly and per-tournament flag counts."""
+
+    df = read_archive_year(path)
+    if query:
+        df = df.query(query)
+    scored = score_frame(df, columns, models)
+
+    by_year = _flag_rates(scored)
+    by_year.insert(0, "year", year)
+    by_year.insert(0, "population", population_label(query))
+
+    by_tournament = _flag_rates(scored, [df["tourney_id"], df["tourney_name"]]).reset_index()
+    by_tournament.insert(0, "year", year)
+    by_tournament.insert(0, "population", population_label(query))
+    return by_year, by_tournament
+
+
+def replay_archive(
+    columns: Iterable[str],
+    archive_dir: str | Path = ARCHIVE_DIR,
+    baselines: WindowedBaselines | None = None,
+    max_workers: int | None = None,
+    query: str | None = BASELINE_POPULATION_QUERY,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Replay every archive season in a process pool.
+
+    Each season's ``query`` rows are scored against models that exclude it,
+    derived from yearly densities over the same population by subtracting that
+    season's row. Workers read one season at a time, so memory stays bounded
+    by the largest season.
+    """
+
+    columns = list(columns)
+    if baselines is None:
+        baselines = build_windowed_baselines(columns, archive_dir, query)
+    elif baselines.source and baselines.source[2] != (query or None):
+        raise ValueError(
+            f"Baselines were built for {population_label(baselines.source[2])!r}, "
+            f"not {population_label(query)!r}"
+        )
+
+    paths = archive_paths(archive_dir)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                replay_year, year, path, columns, baselines.held_out_models(year), query
+            )
+            for year, path in paths.items()
+        ]
+        results = [future.result() for future in futures]
+
+    if not results:
+        return pd.DataFrame(), pd.DataFrame()
+
+    by_year = pd.concat([result[0] for result in results], ignore_index=True)
+    by_tournament = pd.concat([result[1] for result in results], ignore_index=True)
+    return by_year, by_tournament
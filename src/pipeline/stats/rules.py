@@ -0,0 +1,112 @@
+"""Deterministic business rules evaluated column-wise over a batch of matches."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ..config import RULE_THRESHOLDS
+from ..models.tennis_models import Decision
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """A boolean ``DataFrame.eval`` expression that must hold for every match.
+
+    Rows where any of ``columns`` is missing are ``NOT_EVALUATED``; rows where
+    the expression is false take the rule's ``severity``.
+    """
+
+    name: str
+    expression: str
+    columns: tuple[str, ...]
+    severity: Decision = Decision.ERROR
+
+    @property
+    def status_column(self) -> str:
+        return f"rule_{self.name}_status"
+
+
+DETERMINISTIC_RULES: tuple[Rule, ...] = (
+    Rule(
+        name="winner_age",
+        expression=f"winner_age >= {RULE_THRESHOLDS['min_age']}",
+        columns=("winner_age",),
+    ),
+    Rule(
+        name="loser_age",
+        expression=f"loser_age >= {RULE_THRESHOLDS['min_age']}",
+        columns=("loser_age",),
+    ),
+    # Retirements, walkovers and defaults legitimately end early.
+    Rule(
+        name="best_of_5_duration",
+        expression=(
+            "(best_of != 5) | (completed == False) | ("
+            f"(minutes > {RULE_THRESHOLDS['min_minutes_best_of_5']}) & "
+            f"(minutes < {RULE_THRESHOLDS['max_minutes_best_of_5']}))"
+        ),
+        columns=("best_of", "minutes", "completed"),
+    ),
+    Rule(
+        name="w_serve_consistency",
+        expression="w_1stIn <= w_svpt",
+        columns=("w_1stIn", "w_svpt"),
+    ),
+    Rule(
+        name="l_serve_consistency",
+        expression="l_1stIn <= l_svpt",
+        columns=("l_1stIn", "l_svpt"),
+    ),
+    Rule(
+        name="surface",
+        expression='surface == "Hard"',
+        columns=("surface",),
+    ),
+    Rule(
+        name="w_max_points_in_row",
+        expression=f"w_maxPointsInRow <= {RULE_THRESHOLDS['max_points_in_row']}",
+        columns=("w_maxPointsInRow",),
+        severity=Decision.WARNING,
+    ),
+    Rule(
+        name="l_max_points_in_row",
+        expression=f"l_maxPointsInRow <= {RULE_THRESHOLDS['max_points_in_row']}",
+        columns=("l_maxPointsInRow",),
+        severity=Decision.WARNING,
+    ),
+)
+
+
+# Rules whose inputs the live SofaScore fetch supplies. Ages are not part of
+# the event payload, so the age rules only run on archive data (replay).
+LIVE_RULES: tuple[Rule, ...] = tuple(
+    rule for rule in DETERMINISTIC_RULES if rule.name not in {"winner_age", "loser_age"}
+)
+
+
+def evaluate_rules(
+    frame: pd.DataFrame,
+    rules: Iterable[Rule] = DETERMINISTIC_RULES,
+) -> pd.DataFrame:
+    """Return one ``Decision`` column per rule, aligned with ``frame``'s index."""
+
+    decisions: dict[str, np.ndarray] = {}
+    for rule in rules:
+        status = np.empty(len(frame), dtype=object)
+        status[:] = Decision.NOT_EVALUATED
+        if all(column in frame for column in rule.columns) and len(frame):
+            evaluable = frame[list(rule.columns)].notna().all(axis=1).to_numpy()
+            passed = pd.Series(frame.eval(rule.expression)).to_numpy(
+                dtype=bool, na_value=False
+            )
+            status[evaluable] = rule.severity
+            status[evaluable & passed] = Decision.CLEAN
+        decisions[rule.status_column] = status
+
+    # ``dtype=object`` keeps the Decision members; pandas 3 would otherwise
+    # infer a string dtype that no longer compares equal to them.
+    return pd.DataFrame(decisions, index=frame.index, dtype=object)
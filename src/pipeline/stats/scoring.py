@@ -0,0 +1,105 @@
+"""Batch scoring shared by the Prefect flow and the local scoring service."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from ..config import SOFASCORE_TO_BASELINE
+from ..models.tennis_models import Decision, aggregate_status
+from .calculators import KDEModel, evaluate_metric
+from .players import PlayerBaselines
+from .rules import LIVE_RULES, evaluate_rules
+
+PlayerIds = tuple[int | None, int | None]
+
+
+def tracked_columns() -> list[str]:
+    suffixes = set(SOFASCORE_TO_BASELINE.values())
+    return [f"{prefix}_{suffix}" for suffix in sorted(suffixes) for prefix in ("w", "l")]
+
+
+def evaluate_match(
+    match_id: str,
+    metrics: dict[str, float],
+    tracked_columns: Iterable[str],
+    models: dict[str, KDEModel],
+    rule_decisions: dict[str, Decision],
+    player_baselines: PlayerBaselines,
+    player_ids: PlayerIds,
+) -> dict[str, object]:
+    row: dict[str, object] = {"match_id": match_id}
+    statuses: list[Decision] = []
+    ids_by_prefix = dict(zip(("w", "l"), player_ids))
+
+    for column in tracked_columns:
+        value = metrics.get(column)
+        evaluation = evaluate_metric(column, value, models)
+        row[column] = evaluation.value
+        row[f"{column}_p_value"] = evaluation.p_value
+        row[f"{column}_player_p_value"] = player_baselines.p_value(
+            column, ids_by_prefix[column.split("_", 1)[0]], evaluation.value
+        )
+        row[f"{column}_status"] = evaluation.status.value
+        statuses.append(evaluation.status)
+
+    for status_column, decision in rule_decisions.items():
+        row[status_column] = decision.value
+        statuses.append(decision)
+
+    row["overall_status"] = aggregate_status(statuses).value
+    return row
+
+
+def score_matches(
+    matches: dict[str, dict[str, float]],
+    models: dict[str, KDEModel],
+    player_baselines: PlayerBaselines,
+    player_ids: dict[str, PlayerIds] | None = None,
+    columns: Iterable[str] | None = None,
+) -> list[dict[str, object]]:
+    """Score a batch of ``match_id -> metrics`` into report rows."""
+
+    columns = list(columns) if columns is not None else tracked_columns()
+    player_ids = player_ids or {}
+
+    # Deterministic rules run once over the whole batch rather than per match.
+    rule_frame = evaluate_rules(
+        pd.DataFrame.from_dict(matches, orient="index").reindex(list(matches)),
+        LIVE_RULES,
+    )
+
+    return [
+        evaluate_match(
+            match_id,
+            metrics,
+            columns,
+            models,
+            rule_frame.loc[match_id].to_dict(),
+            player_baselines,
+            player_ids.get(match_id, (None, None)),
+        )
+        for match_id, metrics in matches.items()
+    ]
+
+
+def ingest_matches(
+    player_baselines: PlayerBaselines,
+    matches: dict[str, dict[str, float]],
+    player_ids: dict[str, PlayerIds],
+    save_path: str | Path | None = None,
+) -> int:
+    """Fold scored matches with known Sackmann ids into the player baselines."""
+
+    ingested = 0
+    for match_id, metrics in matches.items():
+        winner_id, loser_id = player_ids.get(match_id, (None, None))
+        if winner_id is None and loser_id is None:
+            continue
+        ingested += player_baselines.update_match(match_id, winner_id, loser_id, metrics)
+
+    if ingested and save_path is not None:
+        player_baselines.save(save_path)
+    return ingested
@@ -0,0 +1,311 @@
+"""Rolling-window baselines assembled from per-year binned densities."""
+
+from __future__ import annotations
+
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from ..config import ARCHIVE_DIR, BASELINE_POPULATION_QUERY, WINDOW_BASELINE
+from .archive import archive_fingerprint, archive_paths, iter_archive, read_archive_year
+from .calculators import KDEModel
+
+
+@dataclass(slots=True)
+class YearlyDensity:
+    """Histogram counts and ``(n, sum, sum of squares)`` per season on a fixed grid.
+
+    Every quantity is additive, so a window of seasons is the sum of its rows
+    and sliding it only adds the newest season and subtracts the oldest.
+    """
+
+    column: str
+    edges: np.ndarray
+    first_year: int
+    counts: np.ndarray
+    moments: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        column: str,
+        samples_by_year: dict[int, np.ndarray],
+        bins: int = WINDOW_BASELINE["bins"],
+    ) -> YearlyDensity:
+        samples_by_year = {
+            year: samples[np.isfinite(samples)] for year, samples in samples_by_year.items()
+        }
+        pooled = np.concatenate(list(samples_by_year.values())) if samples_by_year else np.array([])
+        if pooled.size == 0:
+            raise ValueError(f"No finite samples available for column '{column}'")
+
+        span = pooled.std(ddof=1) if pooled.size > 1 else 1.0
+        if span <= 0:
+            span = 1.0
+        padding = span * 3
+        edges = np.linspace(pooled.min() - padding, pooled.max() + padding, bins + 1)
+
+        first_year = min(samples_by_year)
+        n_years = max(samples_by_year) - first_year + 1
+        density = cls(
+            column=column,
+            edges=edges,
+            first_year=first_year,
+            counts=np.zeros((n_years, bins), dtype=np.int32),
+            moments=np.zeros((n_years, 3)),
+        )
+        for year, samples in samples_by_year.items():
+            density.add_samples(year, samples)
+        return density
+
+    @property
+    def last_year(self) -> int:
+        return self.first_year + len(self.counts) - 1
+
+    def _row(self, year: int) -> int:
+        if year < self.first_year:
+            raise ValueError(f"{self.column}: year {year} predates {self.first_year}")
+        if year > self.last_year:
+            grow = year - self.last_year
+            bins = self.counts.shape[1]
+            self.counts = np.vstack((self.counts, np.zeros((grow, bins), dtype=np.int32)))
+            self.moments = np.vstack((self.moments, np.zeros((grow, 3))))
+        return year - self.first_year
+
+    def clear_year(self, year: int) -> None:
+        if self.first_year <= year <= self.last_year:
+            self.counts[year - self.first_year] = 0
+            self.moments[year - self.first_year] = 0
+
+    def add_samples(self, year: int, samples: np.ndarray) -> None:
+        """Fold new results for ``year`` into its row; appends the year if new."""
+
+        samples = np.asarray(samples, dtype=float)
+        samples = samples[np.isfinite(samples)]
+        row = self._row(year)
+        bins = self.counts.shape[1]
+        index = np.clip(np.searchsorted(self.edges, samples, side="right") - 1, 0, bins - 1)
+        self.counts[row] += np.bincount(index, minlength=bins).astype(np.int32)
+        self.moments[row] += (samples.size, samples.sum(), np.square(samples).sum())
+
+    def window_totals(self, end_year: int, years: int) -> tuple[np.ndarray, np.ndarray]:
+        start = max(end_year - years + 1, self.first_year) - self.first_year
+        stop = min(end_year, self.last_year) - self.first_year + 1
+        if stop <= start:
+            return np.zeros(self.counts.shape[1]), np.zeros(3)
+        return (
+            self.counts[start:stop].sum(axis=0, dtype=np.int64),
+            self.moments[start:stop].sum(axis=0),
+        )
+
+    def to_model(self, counts: np.ndarray, moments: np.ndarray) -> KDEModel | None:
+        """Gaussian-smooth binned counts into a ``KDEModel`` (binned KDE).
+
+        The bandwidth follows Scott's rule from the window's own moments, as
+        ``gaussian_kde`` would on the raw samples.
+        """
+
+        n, total, total_sq = moments
+        if n < WINDOW_BASELINE["min_samples"]:
+            return None
+
+        variance = max((total_sq - total**2 / n) / (n - 1), 0.0)
+        width = self.edges[1] - self.edges[0]
+        bandwidth = np.sqrt(variance) * n ** (-1 / 5) / width
+        if bandwidth > 0:
+            reach = min(int(np.ceil(4 * bandwidth)), (len(counts) - 1) // 2)
+            offsets = np.arange(-reach, reach + 1)
+            kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+            pdf = np.convolve(counts, kernel / kernel.sum(), mode="same")
+        else:
+            pdf = counts.astype(float)
+
+        grid = (self.edges[:-1] + self.edges[1:]) / 2
+        cdf = np.concatenate((
+            [0.0],
+            np.cumsum((pdf[1:] + pdf[:-1]) / 2 * np.diff(grid)),
+        ))
+        if cdf[-1] <= 0:
+            return None
+        cdf /= cdf[-1]
+        return KDEModel(column=self.column, grid=grid, cdf=cdf)
+
+    def window(self, end_year: int, years: int) -> KDEModel | None:
+        return self.to_model(*self.window_totals(end_year, years))
+
+    def held_out(self, year: int) -> KDEModel | None:
+        """Model over every season except ``year`` (leave-one-year-out)."""
+
+        counts = self.counts.sum(axis=0, dtype=np.int64)
+        moments = self.moments.sum(axis=0)
+        if self.first_year <= year <= self.last_year:
+            counts -= self.counts[year - self.first_year]
+            moments -= self.moments[year - self.first_year]
+        return self.to_model(counts, moments)
+
+    def rolling(self, years: int, first_end_year: int | None = None) -> Iterator[tuple[int, KDEModel | None]]:
+        """Yield ``(end_year, model)`` for each window position, oldest first."""
+
+        end_year = first_end_year or self.first_year + years - 1
+        counts, moments = self.window_totals(end_year, years)
+        counts = counts.astype(np.int64)
+        yield end_year, self.to_model(counts, moments)
+
+        while end_year < self.last_year:
+            end_year += 1
+            newest = end_year - self.first_year
+            counts += self.counts[newest]
+            moments += self.moments[newest]
+            oldest = end_year - years - self.first_year
+            if oldest >= 0:
+                counts -= self.counts[oldest]
+                moments -= self.moments[oldest]
+            yield end_year, self.to_model(counts, moments)
+
+
+@dataclass(slots=True)
+class WindowedBaselines:
+    densities: dict[str, YearlyDensity] = field(default_factory=dict)
+    # (columns, archive dir, population query) the densities were built from.
+    source: tuple = ()
+    # Archive fingerprint (season -> mtime) of the seasons folded in.
+    seasons: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def last_year(self) -> int | None:
+        return max((density.last_year for density in self.densities.values()), default=None)
+
+    def models(self, years: int, end_year: int | None = None) -> dict[str, KDEModel]:
+        """Return models for the ``years`` seasons ending at ``end_year``."""
+
+        end_year = end_year or self.last_year
+        models: dict[str, KDEModel] = {}
+        if end_year is None:
+            return models
+        for column, density in self.densities.items():
+            model = density.window(end_year, years)
+            if model is not None:
+                models[column] = model
+        return models
+
+    def held_out_models(self, year: int) -> dict[str, KDEModel]:
+        models: dict[str, KDEModel] = {}
+        for column, density in self.densities.items():
+            model = density.held_out(year)
+            if model is not None:
+                models[column] = model
+        return models
+
+    def add_year(self, year: int, df: pd.DataFrame) -> None:
+        """Set ``year``'s rows from its (filtered) season frame, replacing earlier counts."""
+
+        for column, density in self.densities.items():
+            density.clear_year(year)
+            if column in df:
+                density.add_samples(year, df[column].to_numpy(dtype=float))
+
+    def clear_year(self, year: int) -> None:
+        for density in self.densities.values():
+            density.clear_year(year)
+
+    def save(self, path: str | Path) -> None:
+        with Path(path).open("wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str | Path) -> WindowedBaselines:
+        with Path(path).open("rb") as fh:
+            return pickle.load(fh)
+
+
+def build_windowed_baselines(
+    columns: Iterable[str],
+    archive_dir: str | Path = ARCHIVE_DIR,
+    query: str | None = BASELINE_POPULATION_QUERY,
+) -> WindowedBaselines:
+    """Bin every archive season per column; ``query`` filters the population.
+
+    The default matches the Australian Open rows behind ``data/out.csv``; pass
+    ``None`` for the whole tour.
+    """
+
+    columns = list(columns)
+    seasons = archive_fingerprint(archive_dir)
+    samples: dict[str, dict[int, np.ndarray]] = {column: {} for column in columns}
+    for year, df in iter_archive(archive_dir):
+        if query:
+            df = df.query(query)
+        for column in columns:
+            if column in df:
+                samples[column][year] = df[column].to_numpy(dtype=float)
+
+    baselines = WindowedBaselines(source=_source_key(columns, archive_dir, query), seasons=seasons)
+    for column, by_year in samples.items():
+        if sum(np.isfinite(values).sum() for values in by_year.values()) < 5:
+            continue
+        baselines.densities[column] = YearlyDensity.build(column, by_year)
+    return baselines
+
+
+def _source_key(columns: Iterable[str], archive_dir: str | Path, query: str | None) -> tuple:
+    return (tuple(columns), str(Path(archive_dir).resolve()), query or None)
+
+
+def sync_windowed_baselines(
+    baselines: WindowedBaselines,
+    archive_dir: str | Path = ARCHIVE_DIR,
+    query: str | None = BASELINE_POPULATION_QUERY,
+) -> bool:
+    """Fold added, replaced or removed archive seasons into ``baselines`` in place.
+
+    Only the changed seasons are read; returns whether anything changed.
+    """
+
+    current = archive_fingerprint(archive_dir)
+    known = getattr(baselines, "seasons", {})
+    removed = set(known) - set(current)
+    changed = {
+        year: path
+        for year, path in archive_paths(archive_dir).items()
+        if known.get(year) != current.get(year)
+    }
+    for year in removed:
+        baselines.clear_year(year)
+    for year, path in changed.items():
+        df = read_archive_year(path)
+        baselines.add_year(year, df.query(query) if query else df)
+    baselines.seasons = current
+    return bool(removed or changed)
+
+
+def load_windowed_baselines(
+    path: str | Path,
+    columns: Iterable[str],
+    archive_dir: str | Path = ARCHIVE_DIR,
+    query: str | None = BASELINE_POPULATION_QUERY,
+) -> WindowedBaselines:
+    """Load cached yearly densities, syncing new archive seasons into them.
+
+    The cache is rebuilt only when ``columns``/``archive_dir``/``query`` changed
+    or a season predates its first year.
+    """
+
+    columns = list(columns)
+    path = Path(path)
+    if path.exists():
+        cached = WindowedBaselines.load(path)
+        if getattr(cached, "source", ()) == _source_key(columns, archive_dir, query):
+            try:
+                if sync_windowed_baselines(cached, archive_dir, query):
+                    cached.save(path)
+                return cached
+            except ValueError:
+                pass
+
+    baselines = build_windowed_baselines(columns, archive_dir, query)
+    baselines.save(path)
+    return baselines
@@ -3,13 +3,14 @@ import datetime as _dt
 from curl_cffi import requests
 from prefect import get_run_logger, task
 
-@task(name="get_ao_mens_singles_ids")
-def get_match_ids(
+@task(name="get_ao_mens_singles_events")
+def get_match_events(
     date: _dt.date | None = None,
     tournament_name: str = "Australian Open, Melbourne, Australia",
     gender: str = "M",
     category: str = "singles"
-) -> list[str]:
+) -> list[dict]:
+    """Return the finished SofaScore events (with team ids/names) for the day."""
     task_logger = get_run_logger()
     target_date = date or _dt.date.today()
     formatted_date = target_date.strftime("%Y-%m-%d")
@@ -26,7 +27,7 @@ def get_match_ids(
         return []
 
     events = payload.get("events", [])
-    filtered_ids = []
+    filtered_events = []
 
     for event in events:
         curr_tournament = event.get("tournament", {}).get("name")
@@ -41,15 +42,25 @@ def get_match_ids(
             curr_tournament == tournament_name and 
             gender in genders and 
             category in categories and
-            status_type == "finished"
+            status_type == "finished" and
+            event.get("id")
         ):
-            match_id = event.get("id")
-            if match_id:
-                filtered_ids.append(str(match_id))
+            filtered_events.append(event)
 
     task_logger.info(
-        f"Retrieved {len(filtered_ids)} {gender} {category.upper()} "
+        f"Retrieved {len(filtered_events)} {gender} {category.upper()} "
         f"match IDs for {tournament_name} on {formatted_date}."
     )
     
-    return filtered_ids
\ No newline at end of file
+    return filtered_events
+
+
+@task(name="get_ao_mens_singles_ids")
+def get_match_ids(
+    date: _dt.date | None = None,
+    tournament_name: str = "Australian Open, Melbourne, Australia",
+    gender: str = "M",
+    category: str = "singles"
+) -> list[str]:
+    events = get_match_events.fn(date, tournament_name, gender, category)
+    return [str(event["id"]) for event in events]
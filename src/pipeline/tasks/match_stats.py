@@ -11,7 +11,7 @@ from prefect import get_run_logger, task
 from prefect.concurrency.sync import rate_limit
 from prefect.cache_policies import NO_CACHE
 
-from ..config import SOFASCORE_TO_BASELINE
+from ..config import SOFASCORE_RULE_INPUTS, SOFASCORE_TO_BASELINE
 
 
 @task(
@@ -20,8 +20,16 @@ from ..config import SOFASCORE_TO_BASELINE
     retry_delay_seconds=15,
     cache_policy=NO_CACHE,
 )
-def get_match_stats(session: requests.Session, match_id: str) -> dict[str, float]:
-    """Fetch SofaScore statistics and return winner/loser metrics we track."""
+def get_match_stats(
+    session: requests.Session,
+    match_id: str,
+    winner_code: int | None = None,
+) -> dict[str, float]:
+    """Fetch SofaScore statistics and return winner/loser metrics we track.
+
+    ``winner_code`` is the event's ``winnerCode`` (1 home, 2 away); the same
+    field orders the player ids, so metrics and ids always agree on the winner.
+    """
 
     logger = get_run_logger()
     url = f"https://api.sofascore.com/api/v1/event/{match_id}/statistics"
@@ -48,10 +56,10 @@ def get_match_stats(session: requests.Session, match_id: str) -> dict[str, float
         logger.error("Failed to fetch stats for %s: %s", match_id, exc)
         raise
 
-    return _extract_metrics(payload)
+    return _extract_metrics(payload, winner_code)
 
 
-def _extract_metrics(data: dict[str, Any]) -> dict[str, float]:
+def _extract_metrics(data: dict[str, Any], winner_code: int | None = None) -> dict[str, float]:
     try:
         stats_all = data["statistics"][0]
     except (KeyError, IndexError, TypeError):
@@ -63,12 +71,15 @@ def _extract_metrics(data: dict[str, Any]) -> dict[str, float]:
         for item in group.get("statisticsItems", [])
     }
 
-    games_item = stat_lookup.get("gamesWon")
-    home_games = _as_float(games_item.get("homeValue")) if games_item else 0.0
-    away_games = _as_float(games_item.get("awayValue")) if games_item else 0.0
-    winner_prefix, loser_prefix = (
-        ("home", "away") if home_games >= away_games else ("away", "home")
-    )
+    if winner_code in (1, 2):
+        home_won = winner_code == 1
+    else:
+        # No result on the event: fall back to whoever won more games.
+        games_item = stat_lookup.get("gamesWon")
+        home_games = _as_float(games_item.get("homeValue")) if games_item else 0.0
+        away_games = _as_float(games_item.get("awayValue")) if games_item else 0.0
+        home_won = home_games >= away_games
+    winner_prefix, loser_prefix = ("home", "away") if home_won else ("away", "home")
 
     metrics: dict[str, float] = {}
     for sofa_key, baseline_suffix in SOFASCORE_TO_BASELINE.items():
@@ -82,9 +93,61 @@ def _extract_metrics(data: dict[str, Any]) -> dict[str, float]:
         metrics[f"w_{baseline_suffix}"] = winner_value
         metrics[f"l_{baseline_suffix}"] = loser_value
 
+    for sofa_key, (value_suffix, total_suffix) in SOFASCORE_RULE_INPUTS.items():
+        if sofa_key not in stat_lookup:
+            continue
+
+        item = stat_lookup[sofa_key]
+        metrics[f"w_{value_suffix}"] = _as_float(item.get(f"{winner_prefix}Value"))
+        metrics[f"l_{value_suffix}"] = _as_float(item.get(f"{loser_prefix}Value"))
+        if total_suffix is not None:
+            metrics[f"w_{total_suffix}"] = _as_float(item.get(f"{winner_prefix}Total"))
+            metrics[f"l_{total_suffix}"] = _as_float(item.get(f"{loser_prefix}Total"))
+
     return metrics
 
 
+def event_metrics(event: dict[str, Any]) -> dict[str, Any]:
+    """Match-level rule inputs (surface, best-of, duration, completion) from a SofaScore event."""
+
+    metrics: dict[str, Any] = {}
+
+    # Retired and walkover events are "finished" too; only the description differs.
+    description = str((event.get("status") or {}).get("description") or "").lower()
+    if description:
+        metrics["completed"] = not any(word in description for word in _INCOMPLETE_STATUSES)
+
+    ground_type = str(event.get("groundType") or "").lower()
+    for surface in ("Hard", "Clay", "Grass", "Carpet"):
+        if surface.lower() in ground_type:
+            metrics["surface"] = surface
+            break
+
+    best_of = _as_float(event.get("defaultPeriodCount"))
+    if best_of == best_of:
+        metrics["best_of"] = best_of
+
+    # Tennis events report each set's duration in seconds as time.periodN.
+    timing = event.get("time") or {}
+    set_seconds = [
+        _as_float(value)
+        for key, value in timing.items()
+        if key.startswith("period") and key[len("period"):].isdigit()
+    ]
+    set_seconds = [value for value in set_seconds if value == value]
+    if set_seconds:
+        metrics["minutes"] = sum(set_seconds) / 60
+    elif event.get("endTimestamp") and event.get("startTimestamp"):
+        metrics["minutes"] = (
+            _as_float(event["endTimestamp"]) - _as_float(event["startTimestamp"])
+        ) / 60
+
+    return metrics
+
+
+_INCOMPLETE_STATUSES = ("retired", "walkover", "default", "abandoned")
+
+
 def _as_float(value: Any) -> float:
     try:
         return float(value)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def archive_dir(tmp_path: Path) -> Path:
+    """An empty Sackmann-style archive directory."""
+
+    path = tmp_path / "archive"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def write_season(archive_dir: Path) -> Callable[..., Path]:
+    """Write ``atp_matches_<year>.csv`` into ``archive_dir`` from column lists."""
+
+    def write(year: int = 2024, **columns: list) -> Path:
+        path = archive_dir / f"atp_matches_{year}.csv"
+        pd.DataFrame(columns).to_csv(path, index=False)
+        return path
+
+    return write
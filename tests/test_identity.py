@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from src.pipeline.stats.identity import IdentityIndex, load_identity_index
+
+
+@pytest.fixture
+def index() -> IdentityIndex:
+    return IdentityIndex.from_frame(pd.DataFrame({
+        "player_id": [1, 2, 3, 4],
+        "name": ["Jannik Sinner", "Jan Sinner", "Alex de Minaur", "Carlos Alcaraz"],
+        "ioc": ["ITA", "GER", "AUS", "ESP"],
+        "hand": ["R", "R", "R", "R"],
+        "height": [191.0, 180.0, 183.0, 183.0],
+        "year": [2024, 2010, 2024, 2024],
+    }))
+
+
+def test_exact_full_name_beats_initials(index):
+    # "Jan Sinner" is also an initials hit for "j sinner" (with better recency
+    # for Jannik); the exact full-name tier must win regardless.
+    assert index.resolve(10, ["Jan Sinner"]) == (2, True)
+    assert index.sofascore[10] == 2
+
+
+def test_initials_need_attribute_agreement(index):
+    assert index.resolve(11, ["J. Sinner"]) == (None, False)
+    assert index.resolve(12, ["J. Sinner"], ioc="ITA") == (1, True)
+    assert 11 not in index.sofascore
+    assert index.sofascore[12] == 1
+
+
+def test_fuzzy_matches_are_gated_and_never_cached(index):
+    assert index.resolve(20, ["Alex de Minuar"]) == (None, False)
+    assert index.resolve(21, ["Alex de Minuar"], ioc="AUS") == (3, False)
+    assert 21 not in index.sofascore
+
+
+def test_resolve_events_drops_low_confidence_ids_for_ingestion(index):
+    event = {
+        "id": 99,
+        "winnerCode": 2,
+        "homeTeam": {"id": 30, "name": "Alex de Minuar", "country": {"alpha3": "AUS"}},
+        "awayTeam": {"id": 31, "name": "Carlos Alcaraz", "country": {"alpha3": "ESP"}},
+    }
+    assert index.resolve_events([event]) == {"99": (4, 3)}
+    assert index.resolve_events([event], confident_only=True) == {"99": (4, None)}
+    assert index.resolve_events([{**event, "winnerCode": None}]) == {}
+
+
+def test_cache_indexes_new_seasons_and_keeps_confident_mappings(
+    tmp_path, archive_dir, write_season
+):
+    fields = ("id", "name", "ioc", "hand", "ht")
+
+    def write_match(year, winner, loser):
+        columns = {f"winner_{name}": [value] for name, value in zip(fields, winner)}
+        columns.update({f"loser_{name}": [value] for name, value in zip(fields, loser)})
+        write_season(year, **columns)
+
+    write_match(2024, (1, "Jannik Sinner", "ITA", "R", 191), (2, "Carlos Alcaraz", "ESP", "R", 183))
+    path = tmp_path / "identity.pkl"
+
+    first = load_identity_index(path, archive_dir)
+    assert first.resolve(10, ["Jannik Sinner"]) == (1, True)
+    assert first.resolve(30, ["Joao Fonseca"]) == (None, False)
+    first.save(path)
+
+    write_match(2025, (3, "Joao Fonseca", "BRA", "R", 183), (2, "Carlos Alcaraz", "ESP", "R", 183))
+    rebuilt = load_identity_index(path, archive_dir)
+    assert rebuilt.resolve(30, ["Joao Fonseca"]) == (3, True)
+    assert rebuilt.sofascore[10] == 1
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("prefect")
+pytest.importorskip("curl_cffi")
+
+from src.pipeline.tasks.match_stats import _extract_metrics, event_metrics  # noqa: E402
+
+SOFASCORE_PAYLOAD = Path(__file__).resolve().parents[1] / "data" / "sofascore.json"
+
+
+@pytest.fixture(scope="module")
+def payload() -> dict:
+    return json.loads(SOFASCORE_PAYLOAD.read_text())
+
+
+def test_winner_code_orders_the_metrics(payload):
+    # Home won more games (24-21), so without a winnerCode home is the winner.
+    home_won = _extract_metrics(payload)
+    assert (home_won["w_aces"], home_won["l_aces"]) == (9.0, 3.0)
+    assert _extract_metrics(payload, 1) == home_won
+
+    away_won = _extract_metrics(payload, 2)
+    assert (away_won["w_aces"], away_won["l_aces"]) == (3.0, 9.0)
+    assert (away_won["w_1stIn"], away_won["w_svpt"]) == (102.0, 153.0)
+    assert (away_won["w_maxPointsInRow"], away_won["l_maxPointsInRow"]) == (4.0, 8.0)
+
+
+def test_extract_metrics_tolerates_missing_statistics():
+    assert _extract_metrics({}) == {}
+
+
+def test_event_metrics_reads_surface_format_and_set_times():
+    event = {
+        "groundType": "Hardcourt outdoor",
+        "defaultPeriodCount": 5,
+        "status": {"code": 100, "description": "Ended", "type": "finished"},
+        "time": {
+            "period1": 3000,
+            "period2": 2400,
+            "period3": 3600,
+            "currentPeriodStartTimestamp": 1,
+        },
+        "startTimestamp": 0,
+        "endTimestamp": 60_000,
+    }
+    assert event_metrics(event) == {
+        "surface": "Hard",
+        "best_of": 5.0,
+        "minutes": 150.0,
+        "completed": True,
+    }
+
+
+def test_event_metrics_falls_back_to_timestamps_and_flags_retirements():
+    event = {
+        "status": {"code": 92, "description": "Retired", "type": "finished"},
+        "startTimestamp": 1_000,
+        "endTimestamp": 4_000,
+    }
+    assert event_metrics(event) == {"minutes": 50.0, "completed": False}
+    assert event_metrics({}) == {}
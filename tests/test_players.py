@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline.stats.players import PlayerBaselines, PlayerHistogram, load_player_baselines
+
+
+@pytest.fixture
+def samples() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(7)
+    player_ids = rng.integers(100, 140, size=2_000)
+    values = rng.poisson(8, size=2_000).astype(float)
+    return player_ids, values
+
+
+def test_streaming_updates_match_batch_build(samples):
+    player_ids, values = samples
+    batch = PlayerHistogram.build("w_aces", player_ids, values)
+
+    # Same grid as the batch build, but every sample folded in one at a time
+    # (starting empty also exercises slot growth past the initial capacity).
+    streamed = PlayerHistogram("w_aces", lower=batch.lower, width=batch.width, bins=batch.bins)
+    for player_id, value in zip(player_ids, values):
+        streamed.update(int(player_id), float(value))
+
+    assert set(streamed.slots) == set(batch.slots)
+    for player_id in batch.slots:
+        count, mean, std = streamed.moments(player_id)
+        expected = values[player_ids == player_id]
+        assert count == expected.size
+        assert mean == pytest.approx(expected.mean())
+        assert std == pytest.approx(expected.std(ddof=1))
+        assert batch.moments(player_id) == pytest.approx((count, mean, std))
+        np.testing.assert_array_equal(
+            streamed.hist[streamed.slots[player_id]], batch.hist[batch.slots[player_id]]
+        )
+
+
+def test_smoothed_p_value_tracks_empirical_cdf():
+    values = np.repeat(np.arange(100, dtype=float), 10)
+    model = PlayerHistogram.build("aces", np.full(values.size, 1), values, bins=100)
+
+    # Median is central; the extremes sit in the tails.
+    assert model.p_value(1, 49.5) == pytest.approx(1.0, abs=0.02)
+    assert model.p_value(1, 20.0) == pytest.approx(2 * 20 / 100, abs=0.02)
+    assert model.p_value(1, 500.0) == pytest.approx(0.0, abs=1e-9)
+    assert model.p_value(2, 20.0) is None
+
+
+def test_values_just_past_the_history_are_not_zero():
+    rng = np.random.default_rng(3)
+    values = rng.poisson(8, size=40).astype(float)
+    model = PlayerHistogram.build("aces", np.full(values.size, 1), values)
+
+    assert 0.0 < model.p_value(1, values.max() + 1) < 0.2
+
+
+def test_min_matches_gate():
+    model = PlayerHistogram.build("aces", np.full(9, 1), np.arange(9, dtype=float))
+    assert model.p_value(1, 2.0) is None
+
+
+def test_players_are_modelled_across_roles():
+    frame = pd.DataFrame({
+        "winner_id": [1] * 6 + [2] * 6,
+        "loser_id": [2] * 6 + [1] * 6,
+        "w_aces": [10.0] * 12,
+        "l_aces": [2.0] * 12,
+    })
+    baselines = PlayerBaselines.from_frame(frame, ["w_aces", "l_aces"])
+
+    assert set(baselines.models) == {"aces"}
+    count, mean, _ = baselines.models["aces"].moments(1)
+    assert (count, mean) == (12, pytest.approx(6.0))
+    # Player 1's aces as loser inform their w_aces p-value too.
+    assert baselines.p_value("w_aces", 1, 2.0) == baselines.p_value("l_aces", 1, 2.0)
+
+
+def test_update_match_ingests_once():
+    frame = pd.DataFrame({
+        "winner_id": [1] * 5,
+        "loser_id": [2] * 5,
+        "w_aces": [5.0] * 5,
+        "l_aces": [3.0] * 5,
+    })
+    baselines = PlayerBaselines.from_frame(frame, ["w_aces", "l_aces"])
+
+    assert baselines.update_match("m1", 2, 1, {"w_aces": 10.0, "l_aces": 1.0})
+    assert not baselines.update_match("m1", 2, 1, {"w_aces": 10.0, "l_aces": 1.0})
+    assert baselines.models["aces"].moments(1)[:2] == pytest.approx((6, 26 / 6))
+    assert baselines.models["aces"].moments(2)[:2] == pytest.approx((6, 25 / 6))
+
+
+def test_cache_rebuilds_when_columns_or_query_change(tmp_path, archive_dir, write_season):
+    write_season(
+        winner_id=[1, 1, 2],
+        loser_id=[2, 3, 3],
+        best_of=[5, 5, 3],
+        w_ace=[5, 6, 7],
+        l_ace=[1, 2, 3],
+        w_df=[0, 1, 2],
+    )
+    path = tmp_path / "players.pkl"
+
+    first = load_player_baselines(path, ["w_aces"], archive_dir)
+    assert set(first.models) == {"aces"}
+    assert first.models["aces"].count.sum() == 2
+    assert set(load_player_baselines(path, ["w_aces"], archive_dir).models) == {"aces"}
+
+    rebuilt = load_player_baselines(path, ["w_aces", "w_doubleFaults"], archive_dir)
+    assert set(rebuilt.models) == {"aces", "doubleFaults"}
+
+    whole = load_player_baselines(path, ["w_aces", "w_doubleFaults"], archive_dir, query=None)
+    assert whole.models["aces"].count.sum() == 3
+
+
+def test_cache_rebuilds_when_a_season_is_added(tmp_path, archive_dir, write_season):
+    def write_aces(year, winner_id, loser_id):
+        write_season(
+            year, winner_id=[winner_id], loser_id=[loser_id], best_of=[5], w_ace=[9], l_ace=[4]
+        )
+
+    columns = ["w_aces", "l_aces"]
+    path = tmp_path / "players.pkl"
+    write_aces(2024, 1, 2)
+    assert set(load_player_baselines(path, columns, archive_dir).models["aces"].slots) == {1, 2}
+
+    write_aces(2025, 3, 1)
+    models = load_player_baselines(path, columns, archive_dir).models["aces"]
+    assert set(models.slots) == {1, 2, 3}
+    assert models.moments(1)[0] == 2
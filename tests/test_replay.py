@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.stats.replay import _flag_rates, replay_year, score_frame
+from src.pipeline.stats.windows import build_windowed_baselines
+
+
+def test_replay_year_scores_only_the_baseline_population(archive_dir, write_season):
+    path = write_season(
+        tourney_id=["2024-580"] * 6 + ["2024-540"] * 6,
+        tourney_name=["Australian Open"] * 6 + ["Wimbledon"] * 6,
+        w_ace=[5, 6, 7, 8, 9, 10, 20, 21, 22, 23, 24, 25],
+    )
+    baselines = build_windowed_baselines(["w_aces"], archive_dir)
+    models = {"w_aces": baselines.densities["w_aces"].window(2024, 1)}
+
+    by_year, by_tournament = replay_year(2024, path, ["w_aces"], models)
+    assert by_year.loc[0, "population"] == 'tourney_name == "Australian Open"'
+    assert by_year.loc[0, "matches"] == 6
+    assert list(by_tournament["tourney_name"]) == ["Australian Open"]
+
+    by_year, _ = replay_year(2024, path, ["w_aces"], models, query=None)
+    assert by_year.loc[0, "population"] == "whole tour"
+    assert by_year.loc[0, "matches"] == 12
+
+
+def test_rule_only_rows_are_not_evaluated():
+    frame = pd.DataFrame({
+        "winner_age": [20.0, 12.0, 25.0],
+        "w_aces": [np.nan, np.nan, 8.0],
+    })
+    scored = score_frame(frame, ["w_aces"], {})
+    rates = _flag_rates(scored)
+
+    # The age rule flags row 1, but without models no row has a scored stat.
+    assert rates.loc[0, "evaluated"] == 0
+    assert rates.loc[0, "error"] == 0
+    assert rates.loc[0, "rule_winner_age_flagged"] == 1
+    assert np.isnan(rates.loc[0, "flag_rate"])
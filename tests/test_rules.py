@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.models.tennis_models import Decision
+from src.pipeline.stats.rules import DETERMINISTIC_RULES, LIVE_RULES, Rule, evaluate_rules
+
+
+def test_missing_columns_are_not_evaluated():
+    frame = pd.DataFrame({"winner_age": [20.0, np.nan]}, index=["a", "b"])
+    decisions = evaluate_rules(frame, DETERMINISTIC_RULES)
+
+    assert list(decisions.index) == ["a", "b"]
+    assert set(decisions.columns) == {rule.status_column for rule in DETERMINISTIC_RULES}
+    assert decisions.loc["a", "rule_winner_age_status"] == Decision.CLEAN
+    assert decisions.loc["b", "rule_winner_age_status"] == Decision.NOT_EVALUATED
+    assert (decisions["rule_loser_age_status"] == Decision.NOT_EVALUATED).all()
+
+
+def test_failures_take_the_rule_severity():
+    frame = pd.DataFrame({
+        "w_1stIn": [50.0, 90.0],
+        "w_svpt": [80.0, 80.0],
+        "w_maxPointsInRow": [4.0, 20.0],
+    })
+    decisions = evaluate_rules(frame, DETERMINISTIC_RULES)
+
+    assert list(decisions["rule_w_serve_consistency_status"]) == [Decision.CLEAN, Decision.ERROR]
+    assert list(decisions["rule_w_max_points_in_row_status"]) == [Decision.CLEAN, Decision.WARNING]
+
+
+def test_best_of_5_duration_skips_incomplete_matches():
+    frame = pd.DataFrame({
+        "best_of": [5, 5, 5, 3],
+        "minutes": [30.0, 30.0, 200.0, 30.0],
+        "completed": [True, False, True, True],
+    })
+    statuses = evaluate_rules(frame, DETERMINISTIC_RULES)["rule_best_of_5_duration_status"]
+
+    assert list(statuses) == [Decision.ERROR, Decision.CLEAN, Decision.CLEAN, Decision.CLEAN]
+
+
+def test_custom_rule_and_empty_frame():
+    rule = Rule(name="positive", expression="x > 0", columns=("x",), severity=Decision.WARNING)
+
+    assert evaluate_rules(pd.DataFrame({"x": []}), [rule]).empty
+    assert evaluate_rules(pd.DataFrame({"x": [-1]}), [rule]).iloc[0, 0] == Decision.WARNING
+
+
+def test_live_rules_exclude_age():
+    assert {rule.name for rule in LIVE_RULES}.isdisjoint({"winner_age", "loser_age"})
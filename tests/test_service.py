@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from urllib import request
+
+import pandas as pd
+import pytest
+
+from src.pipeline.service.client import ScoringClient
+from src.pipeline.service.server import ScoringService, _ScoringHTTPServer
+
+
+@pytest.fixture
+def service(tmp_path, archive_dir, write_season) -> ScoringService:
+    aces = [float(value) for value in range(2, 22)]
+    baseline = tmp_path / "out.csv"
+    pd.DataFrame({"w_aces": aces, "l_aces": aces}).to_csv(baseline, index=False)
+    write_season(
+        2024,
+        tourney_name=["Australian Open"] * 20,
+        best_of=[5] * 20,
+        winner_id=[1, 2] * 10,
+        loser_id=[2, 1] * 10,
+        w_ace=aces,
+        l_ace=aces,
+    )
+    return ScoringService(
+        baseline,
+        tmp_path / "players.pkl",
+        tmp_path / "windows.pkl",
+        archive_dir=archive_dir,
+    )
+
+
+@pytest.fixture
+def client(service):
+    httpd = _ScoringHTTPServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield ScoringClient(f"http://127.0.0.1:{httpd.server_address[1]}", timeout=5)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(client: ScoringClient, body: bytes) -> tuple[int, dict]:
+    req = request.Request(f"{client.url}/score", data=body, method="POST")
+    try:
+        with request.urlopen(req, timeout=5) as response:
+            return response.status, json.load(response)
+    except request.HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+def test_scores_and_reports_artifacts(client, service):
+    assert client.available()
+    assert client.health()["artifacts"] == service.artifacts()
+
+    artifacts = {"baseline": service.paths["baseline"]}
+    row = client.score({"m1": {"w_aces": 11.0}}, artifacts=artifacts)[0]
+    assert row["match_id"] == "m1"
+    assert row["w_aces_status"] == "CLEAN"
+
+
+def test_mismatched_artifacts_are_rejected_with_409(client, tmp_path):
+    payload = {"matches": {}, "artifacts": {"baseline": str(tmp_path / "other.csv")}}
+    status, body = _post(client, json.dumps(payload).encode())
+    assert status == 409
+    assert "baseline" in body["error"]
+
+    with pytest.raises(RuntimeError, match="artifacts differ"):
+        client.score({}, artifacts={"window_query": None, "window_baseline": "elsewhere.pkl"})
+
+
+def test_bad_requests_get_400_and_failures_500(client, service, monkeypatch):
+    status, body = _post(client, b"not json")
+    assert status == 400 and body["error"]
+
+    def explode(payload):
+        raise ZeroDivisionError("boom")
+
+    monkeypatch.setattr(service, "score", explode)
+    status, body = _post(client, b"{}")
+    assert (status, body) == (500, {"error": "boom"})
+
+
+def test_reloads_when_an_artifact_or_season_changes(service, write_season):
+    assert not service.reload_if_changed()
+
+    baseline = service.paths["baseline"]
+    os.utime(baseline, ns=(1, 1))
+    assert service.reload_if_changed()
+    assert not service.reload_if_changed()
+
+    write_season(
+        2025,
+        tourney_name=["Australian Open"] * 6,
+        best_of=[5] * 6,
+        w_ace=[5, 6, 7, 8, 9, 10],
+    )
+    assert service.reload_if_changed()
+    assert service.windowed.last_year == 2025
+
+
+def test_own_ingest_write_does_not_trigger_a_reload(service):
+    loaded_at = service.loaded_at
+    service.score({
+        "matches": {"m1": {"w_aces": 11.0, "l_aces": 4.0}},
+        "player_ids": {"m1": [1, 2]},
+        "ingest_ids": {"m1": [1, 2]},
+    })
+
+    assert "m1" in service.player_baselines.ingested
+    assert service.paths["player_baseline"].exists()
+    assert not service.reload_if_changed()
+    assert service.loaded_at == loaded_at
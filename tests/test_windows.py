@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from src.pipeline.stats.windows import YearlyDensity, load_windowed_baselines
+
+
+@pytest.fixture
+def samples_by_year() -> dict[int, np.ndarray]:
+    rng = np.random.default_rng(11)
+    # Drift the mean so every window position sees a different mixture.
+    return {
+        year: rng.normal(6 + 0.3 * (year - 2000), 2.5, size=rng.integers(80, 160))
+        for year in range(2000, 2012)
+    }
+
+
+def assert_same_model(left, right):
+    assert (left is None) == (right is None)
+    if left is not None:
+        np.testing.assert_allclose(left.grid, right.grid)
+        np.testing.assert_allclose(left.cdf, right.cdf, atol=1e-9)
+
+
+@pytest.mark.parametrize("years", [1, 3, 5])
+def test_rolling_matches_window_at_every_position(samples_by_year, years):
+    density = YearlyDensity.build("w_aces", samples_by_year)
+
+    positions = list(density.rolling(years))
+    assert [end_year for end_year, _ in positions] == list(
+        range(2000 + years - 1, density.last_year + 1)
+    )
+    for end_year, model in positions:
+        assert_same_model(model, density.window(end_year, years))
+
+
+def test_held_out_matches_build_without_that_year(samples_by_year):
+    density = YearlyDensity.build("w_aces", samples_by_year)
+
+    for year in (2000, 2005, 2011):
+        without = YearlyDensity(
+            column=density.column,
+            edges=density.edges,
+            first_year=density.first_year,
+            counts=np.zeros_like(density.counts),
+            moments=np.zeros_like(density.moments),
+        )
+        for other, samples in samples_by_year.items():
+            if other != year:
+                without.add_samples(other, samples)
+        assert_same_model(density.held_out(year), without.window(density.last_year, 100))
+
+
+def test_binned_kde_tracks_gaussian_kde(samples_by_year):
+    density = YearlyDensity.build("w_aces", samples_by_year)
+    model = density.window(density.last_year, 3)
+
+    pooled = np.concatenate([samples_by_year[year] for year in (2009, 2010, 2011)])
+    reference = gaussian_kde(pooled)
+    for value in np.percentile(pooled, [1, 10, 50, 90, 99]):
+        expected = reference.integrate_box_1d(-np.inf, value)
+        assert np.interp(value, model.grid, model.cdf) == pytest.approx(expected, abs=0.01)
+
+
+def test_cache_rebuilds_when_query_or_columns_change(tmp_path, archive_dir, write_season):
+    write_season(
+        tourney_name=["Australian Open"] * 6 + ["Wimbledon"] * 6,
+        w_ace=[5, 6, 7, 8, 9, 10, 20, 21, 22, 23, 24, 25],
+        w_df=[1, 2, 3, 4, 5, 6, 1, 2, 3, 4, 5, 6],
+    )
+    path = tmp_path / "windows.pkl"
+
+    default = load_windowed_baselines(path, ["w_aces"], archive_dir)
+    assert default.densities["w_aces"].moments[0, 0] == 6
+
+    whole_tour = load_windowed_baselines(path, ["w_aces"], archive_dir, query=None)
+    assert whole_tour.densities["w_aces"].moments[0, 0] == 12
+
+    both = load_windowed_baselines(path, ["w_aces", "w_doubleFaults"], archive_dir, query=None)
+    assert set(both.densities) == {"w_aces", "w_doubleFaults"}
+    cached = load_windowed_baselines(path, ["w_aces", "w_doubleFaults"], archive_dir, query=None)
+    assert cached.source == both.source
+
+
+def test_new_and_replaced_seasons_are_synced_without_a_rebuild(tmp_path, archive_dir, write_season):
+    def write_aces(year, aces):
+        return write_season(year, tourney_name=["Australian Open"] * len(aces), w_ace=aces)
+
+    write_aces(2022, [5, 6, 7, 8, 9, 10])
+    write_aces(2023, [6, 7, 8, 9, 10, 11])
+    path = tmp_path / "windows.pkl"
+    first = load_windowed_baselines(path, ["w_aces"], archive_dir)
+    assert first.last_year == 2023
+
+    write_aces(2024, [7, 8, 9, 10, 11, 12, 13])
+    os.utime(write_aces(2023, [6, 7, 8]), ns=(1, 1))
+    synced = load_windowed_baselines(path, ["w_aces"], archive_dir)
+    density = synced.densities["w_aces"]
+
+    assert synced.last_year == 2024
+    # Same grid as the first build: the seasons were folded in, not rebuilt.
+    np.testing.assert_array_equal(density.edges, first.densities["w_aces"].edges)
+    assert list(density.moments[:, 0]) == [6, 3, 7]
+    assert list(density.counts.sum(axis=1)) == [6, 3, 7]
+    assert load_windowed_baselines(path, ["w_aces"], archive_dir).seasons == synced.seasons
+
+    (archive_dir / "atp_matches_2024.csv").unlink()
+    pruned = load_windowed_baselines(path, ["w_aces"], archive_dir)
+    assert pruned.densities["w_aces"].moments[2, 0] == 0